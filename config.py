@@ -1,7 +1,8 @@
 """
 Centralized configuration loader.
 
-- Reads environment variables (via python-dotenv if a .env is present).
+- Reads environment variables, falling back to a .env file if present
+  (process environment wins).
 - Validates required fields.
 - Exposes a cached `get_settings()` for app-wide use.
 """
@@ -10,7 +11,7 @@ import os
 from functools import lru_cache
 from typing import Optional
 from pydantic import BaseModel, Field, ValidationError
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
 
 def _to_bool(value: Optional[str], default: bool = False) -> bool:
@@ -31,30 +32,35 @@ class Settings(BaseModel):
     LLM_TEMPERATURE: float = Field(default=0.2, ge=0.0, le=2.0)
     LLM_MAX_OUTPUT_TOKENS: int = Field(default=2048, ge=256, le=8192)
 
+    # --- Models (optional) ---
+    LOSS_MODEL_PATH: Optional[str] = Field(default=None)
+
     class Config:
         frozen = True
 
 
 def _build_settings_from_env() -> Settings:
-    # Load .env if present (no-op if not)
-    load_dotenv(override=False)
+    # Read .env once (empty if absent) without touching os.environ; the real
+    # environment takes precedence, matching load_dotenv(override=False).
+    env = {**dotenv_values(), **os.environ}
 
     missing: list[str] = []
-    
+
     def req(name: str) -> str:
-        v = os.getenv(name)
+        v = env.get(name)
         if not v:
             missing.append(name)
             return ""
         return v
 
     settings = Settings(
-        PORT=int(os.getenv("PORT", "8000")),
-        LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
+        PORT=int(env.get("PORT") or "8000"),
+        LOG_LEVEL=env.get("LOG_LEVEL") or "INFO",
         GOOGLE_API_KEY=req("GOOGLE_API_KEY"),
-        GOOGLE_MODEL_NAME=os.getenv("GOOGLE_MODEL_NAME", "gemini-2.5-flash"),
-        LLM_TEMPERATURE=float(os.getenv("LLM_TEMPERATURE", "0.2")),
-        LLM_MAX_OUTPUT_TOKENS=int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "2048"))
+        GOOGLE_MODEL_NAME=env.get("GOOGLE_MODEL_NAME") or "gemini-2.5-flash",
+        LLM_TEMPERATURE=float(env.get("LLM_TEMPERATURE") or "0.2"),
+        LLM_MAX_OUTPUT_TOKENS=int(env.get("LLM_MAX_OUTPUT_TOKENS") or "2048"),
+        LOSS_MODEL_PATH=env.get("LOSS_MODEL_PATH") or None,
     )
 
     if missing:
@@ -74,7 +80,7 @@ def _build_settings_from_env() -> Settings:
     return settings
 
 
-@lru_cache(maxsize=1)
+@lru_cache(maxsize=None)
 def get_settings() -> Settings:
     """Get a cached Settings instance."""
     return _build_settings_from_env()
@@ -0,0 +1,83 @@
+"""
+Scalar heuristic kernel shared by the hazard and loss nodes.
+
+`compute_scores` holds the model-free arithmetic for both nodes in one
+function over a fixed tuple of floats. The hazard node runs it once per
+request and carries the loss pair forward in the state, so the loss node
+doesn't repeat it. It is plain Python: a JIT adds nothing measurable for a
+single scalar call per request, and importing/compiling it would add
+startup cost.
+"""
+
+from typing import Any, Dict, FrozenSet, Tuple
+
+
+def compute_scores(
+    revenue: float,
+    employee_count: float,
+    sqft: float,
+    sprinklers: float,
+    year_built: float,
+    cooking: float,
+    public_traffic: float,
+    hazmat: float,
+) -> Tuple[float, float, float, float]:
+    """
+    Return (property_hazard, liability_exposure, expected_loss, pml).
+
+    Flag arguments (sprinklers, cooking, public_traffic, hazmat) are 1.0/0.0.
+    """
+    base = 0.35
+
+    property_hazard = base
+    if sqft > 20000:
+        property_hazard += 0.15
+    if year_built < 1975:
+        property_hazard += 0.12
+    if sprinklers:
+        property_hazard -= 0.10
+    if cooking:
+        property_hazard += 0.12
+    property_hazard = min(1.0, max(0.0, property_hazard))
+
+    liability_exposure = base
+    if employee_count > 50:
+        liability_exposure += 0.15
+    if public_traffic:
+        liability_exposure += 0.12
+    if hazmat:
+        liability_exposure += 0.07
+    liability_exposure = min(1.0, max(0.0, liability_exposure))
+
+    loss = max(5_000.0, revenue * 0.002)  # floor or small share of revenue
+    loss += 100.0 * employee_count
+    loss += 0.05 * sqft
+    if not sprinklers:
+        loss *= 1.15
+    if year_built < 1975:
+        loss *= 1.10
+    if cooking:
+        loss *= 1.20
+    if hazmat:
+        loss *= 1.25
+
+    return property_hazard, liability_exposure, loss, loss * 5.0
+
+
+def kernel_inputs(state: Dict[str, Any]) -> Tuple[float, float, float, float, float, float, float, float]:
+    """Extract the `compute_scores` arguments from request/profile context."""
+    req = state.get("request") or {}
+    profile = state.get("profile") or {}
+    prop = req.get("property") or {}
+    tags: FrozenSet[str] = profile.get("_risk_tag_set") or frozenset(profile.get("risk_tags") or ())
+
+    return (
+        float(req.get("annual_revenue") or 0.0),
+        float(int(req.get("employee_count") or 0)),
+        float(prop.get("sqft") or 0.0),
+        1.0 if prop.get("sprinklers") else 0.0,
+        float(int(prop.get("year_built") or 1980)),
+        1.0 if "cooking" in tags else 0.0,
+        1.0 if "public_foot_traffic" in tags else 0.0,
+        1.0 if "hazmat" in tags else 0.0,
+    )
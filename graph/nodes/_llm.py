@@ -0,0 +1,20 @@
+"""
+Shared LLM call helper for graph nodes.
+"""
+
+from typing import Any, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+_M = TypeVar("_M", bound=BaseModel)
+
+
+async def ainvoke_structured(*, structured_llm: Any, schema: Type[_M], system: str, human: str) -> Optional[_M]:
+    """
+    Ask a chat model already wrapped with `llm.with_structured_output(schema)`
+    (Gemini controlled generation; built once in `build_workflow`), so callers
+    never hand-parse JSON. Returns None if the model produced no parseable
+    object; validation errors propagate, so callers should catch them.
+    """
+    out = await structured_llm.ainvoke([("system", system), ("human", human)])
+    return out if isinstance(out, schema) else None
@@ -12,17 +12,40 @@ Output (merged into state under `profile`):
   "naics_code": str | None,
   "operations_summary": str,
   "risk_tags": list[str],      # e.g., ["cooking", "public_foot_traffic"]
+  "_risk_tag_set": frozenset[str],  # same tags, for O(1) membership checks
   "location_notes": str        # coarse, non-geo-sensitive notes
 }
 """
 
-import json
 from typing import Any, Dict, List, Optional
 
+from pydantic import BaseModel, Field
 
-def _llm_structured_enrichment(
+from ._llm import ainvoke_structured
+
+_SYSTEM_PROMPT = "You are an insurance underwriting assistant."
+_HUMAN_TEMPLATE = (
+    "Normalize the following business information for commercial insurance. "
+    "Fill: predicted_naics (or null), operations_summary (<= 50 words), "
+    "risk_tags (<= 6 short snake_case tokens), issues (<= 3 short tokens). "
+    'Existing NAICS (if any): "{naics}".\n\n'
+    'Business name: "{business_name}"\n'
+    'Operations description: "{operations_desc}"'
+).format_map
+
+
+class _EnrichmentOut(BaseModel):
+    """Structured-output schema for the enrichment call."""
+
+    predicted_naics: Optional[str] = None
+    operations_summary: str = ""
+    risk_tags: List[str] = Field(default_factory=list)
+    issues: List[str] = Field(default_factory=list)
+
+
+async def _llm_structured_enrichment(
     *,
-    llm: Any,
+    structured_llm: Any,
     business_name: str,
     naics_code: Optional[str],
     operations_desc: str,
@@ -34,49 +57,33 @@ def _llm_structured_enrichment(
     - risk_tags (<= 6 short tokens),
     - issues (<= 3 short tokens).
 
-    We instruct it to return ONLY JSON; we then parse with a conservative
-    fallback if the output isn't perfectly valid JSON.
+    Uses structured output, so the reply always matches `_EnrichmentOut`;
+    missing NAICS/summary fall back to the request values.
     """
-    system = (
-        "You are an insurance underwriting assistant. "
-        "Return compact JSON only—no prose."
-    )
-    human = (
-        "Normalize the following business information for commercial insurance. "
-        "Return a JSON object with keys: "
-        "predicted_naics (string|null), operations_summary (string <= 50 words), "
-        "risk_tags (array of <= 6 short snake_case tokens), "
-        "issues (array of <= 3 short tokens). "
-        f'Existing NAICS (if any): "{naics_code}".\n\n'
-        f'Business name: "{business_name}"\n'
-        f'Operations description: "{operations_desc}"'
+    human = _HUMAN_TEMPLATE(
+        {
+            "naics": naics_code,
+            "business_name": business_name,
+            "operations_desc": operations_desc,
+        }
     )
 
-    msg = llm.invoke([("system", system), ("human", human)])
-    raw = getattr(msg, "content", "") or ""
-    try:
-        data = json.loads(raw)
-        if not isinstance(data, dict):
-            raise ValueError("Top-level JSON is not an object.")
-    except Exception:
-        # Minimal fallback if model didn't return clean JSON.
-        data = {
-            "predicted_naics": naics_code,
-            "operations_summary": operations_desc[:300],
-            "risk_tags": [],
-            "issues": [],
-        }
-    # Ensure required keys exist
-    data.setdefault("predicted_naics", naics_code)
-    data.setdefault("operations_summary", operations_desc[:300])
-    data.setdefault("risk_tags", [])
-    data.setdefault("issues", [])
+    out = await ainvoke_structured(
+        structured_llm=structured_llm, schema=_EnrichmentOut, system=_SYSTEM_PROMPT, human=human
+    )
+    if out is None:
+        out = _EnrichmentOut()
+    data = out.model_dump()
+    # Fill gaps the model left empty.
+    data["predicted_naics"] = data["predicted_naics"] or naics_code
+    data["operations_summary"] = data["operations_summary"] or operations_desc[:300]
     return data
 
 
-def run(*, state: Dict[str, Any], llm: Any) -> Dict[str, Any]:
+async def run(state: Dict[str, Any], structured_llm: Any = None) -> Dict[str, Any]:
     """
     Enrich the request and attach a normalized `profile` to the state.
+    `structured_llm` is `llm.with_structured_output(_EnrichmentOut)`.
     """
     req = state.get("request") or {}
 
@@ -86,8 +93,8 @@ def run(*, state: Dict[str, Any], llm: Any) -> Dict[str, Any]:
     operations_desc: str = operations.get("description") or "No description."
 
     # LLM enrichment (NAICS guess + short ops summary + tags)
-    enriched = _llm_structured_enrichment(
-        llm=llm,
+    enriched = await _llm_structured_enrichment(
+        structured_llm=structured_llm,
         business_name=business_name,
         naics_code=naics_code,
         operations_desc=operations_desc,
@@ -101,17 +108,19 @@ def run(*, state: Dict[str, Any], llm: Any) -> Dict[str, Any]:
     if has_sprinklers:
         loc_note += "; sprinklers_present"
 
+    risk_tags: List[str] = list(enriched["risk_tags"])
+
     profile: Dict[str, Any] = {
         "business_name": business_name,
         "naics_code": enriched.get("predicted_naics") or naics_code,
         "operations_summary": enriched.get("operations_summary", operations_desc),
-        "risk_tags": enriched.get("risk_tags", []),
+        "risk_tags": risk_tags,
+        # O(1) membership view for downstream nodes (not part of final API schema)
+        "_risk_tag_set": frozenset(risk_tags),
         "location_notes": loc_note,
         # Keep issues for downstream attention (not part of final API schema)
         "issues": enriched.get("issues", []),
     }
 
-    # Merge into state and return.
-    new_state = dict(state)
-    new_state["profile"] = profile
-    return new_state
+    # Return only the delta; LangGraph merges it into the state.
+    return {"profile": profile}
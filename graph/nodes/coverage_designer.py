@@ -6,7 +6,7 @@ Combines hazard scores and loss estimates to produce a simple recommendation:
 - policy_limits (dict[str, float])
 - deductibles (dict[str, float])
 - pricing_inputs (dict[str, float])
-- rationale (str)  # short explanation from the LLM
+- rationale (str)  # added afterwards by the rationale writer node
 
 The rule set is intentionally small to keep the POC readable.
 """
@@ -73,48 +73,8 @@ def _design_coverages(state: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _llm_rationale(*, llm: Any, state: Dict[str, Any], rec: Dict[str, Any]) -> str:
+def run(state: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Ask the LLM to write a brief, plain-English rationale.
+    Compose the recommendation (without rationale) and merge into state.
     """
-    profile = state.get("profile") or {}
-    name = profile.get("business_name") or "the business"
-    ops = profile.get("operations_summary") or ""
-    ph = float((state.get("hazard_scores") or {}).get("property_hazard") or 0.0)
-    le = float((state.get("hazard_scores") or {}).get("liability_exposure") or 0.0)
-    el = float((state.get("loss_estimates") or {}).get("expected_loss") or 0.0)
-    pml = float((state.get("loss_estimates") or {}).get("pml") or 0.0)
-    covs = ", ".join(rec.get("coverages") or [])
-
-    system = (
-        "You are an insurance underwriting assistant. "
-        "Write one or two short sentences suitable for a customer-facing rationale."
-    )
-    human = (
-        f"Business: {name}\n"
-        f"Ops: {ops}\n"
-        f"Hazard scores: property={ph:.2f}, liability={le:.2f}\n"
-        f"Loss: expected={el:,.0f}, pml={pml:,.0f}\n"
-        f"Recommended coverages: {covs}\n"
-        "Keep it concise and factual."
-    )
-
-    try:
-        msg = llm.invoke([("system", system), ("human", human)])
-        text = getattr(msg, "content", "") or ""
-        return (text.strip().split("\n")[0])[:400] or "Recommendation based on exposure and loss potential."
-    except Exception:
-        return "Recommendation based on exposure and loss potential."
-
-
-def run(*, state: Dict[str, Any], llm: Any) -> Dict[str, Any]:
-    """
-    Compose the final recommendation and merge into state.
-    """
-    rec = _design_coverages(state)
-    rationale = _llm_rationale(llm=llm, state=state, rec=rec)
-    rec["rationale"] = rationale
-
-    new_state = dict(state)
-    new_state["recommendation"] = rec
-    return new_state
+    return {"recommendation": _design_coverages(state)}
@@ -11,24 +11,33 @@ Approach:
 """
 
 import os
+import threading
 from functools import lru_cache
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Optional
 
-import numpy as np
+from config import get_settings
 
-try:
-    # joblib ships with scikit-learn
-    import joblib
-except Exception:  # pragma: no cover
-    joblib = None  # type: ignore
+from ._kernels import compute_scores, kernel_inputs
+
+if TYPE_CHECKING:  # NumPy is only needed on the model path; imported lazily there.
+    import numpy as np
+
+
+# Per-thread (1, 7) feature buffer reused across requests.
+_FEAT_BUF = threading.local()
 
 
 def _clip_nonneg(x: float) -> float:
     return float(max(0.0, x))
 
 
-def _features_from_state(state: Dict[str, Any]) -> np.ndarray:
-    """Extract a tiny numeric vector used by a toy regression model."""
+def _features_for_model(state: Dict[str, Any]) -> "np.ndarray":
+    """
+    Extract a tiny numeric vector used by a toy regression model.
+
+    The returned array is a thread-local buffer overwritten on the next call;
+    consume it before extracting features again.
+    """
     req = state.get("request") or {}
     profile = state.get("profile") or {}
     prop = req.get("property") or {}
@@ -39,45 +48,62 @@ def _features_from_state(state: Dict[str, Any]) -> np.ndarray:
     sprinklers = 1.0 if bool(prop.get("sprinklers")) else 0.0
     year_built = float(prop.get("year_built") or 1980)
 
-    tags: List[str] = list(profile.get("risk_tags") or [])
+    tags: FrozenSet[str] = profile.get("_risk_tag_set") or frozenset(profile.get("risk_tags") or ())
     cooking = 1.0 if "cooking" in tags else 0.0
     public = 1.0 if "public_foot_traffic" in tags else 0.0
 
-    return np.array(
-        [
-            (revenue / 1e6),          # millions of USD
-            employee_count / 100.0,
-            sqft / 10000.0,
-            sprinklers,
-            (year_built - 1900) / 200.0,
-            cooking,
-            public,
-        ],
-        dtype=float,
-    ).reshape(1, -1)
-
-
-@lru_cache(maxsize=1)
-def _load_model(model_path: str):
-    if not joblib:
+    buf = getattr(_FEAT_BUF, "arr", None)
+    if buf is None:
+        import numpy as np
+
+        buf = _FEAT_BUF.arr = np.empty((1, 7), dtype=float)
+
+    buf[0, 0] = revenue / 1e6                  # millions of USD
+    buf[0, 1] = employee_count / 100.0
+    buf[0, 2] = sqft / 10000.0
+    buf[0, 3] = sprinklers
+    buf[0, 4] = (year_built - 1900) / 200.0
+    buf[0, 5] = cooking
+    buf[0, 6] = public
+    return buf
+
+
+@lru_cache(maxsize=None)
+def _load_model(model_path: str) -> Optional[Callable[["np.ndarray"], float]]:
+    """
+    Load a LinearRegression-like model and return a `predict` callable for a
+    single feature row, or None if the model is missing or cannot predict.
+    The capability check happens once here rather than per request: the
+    model must predict a zero feature row without raising.
+    """
+    try:
+        # joblib ships with scikit-learn
+        import joblib
+    except Exception:  # pragma: no cover
         return None
     if not os.path.exists(model_path):
         return None
     try:
-        return joblib.load(model_path)
+        model = joblib.load(model_path)
     except Exception:
         return None
+    if not hasattr(model, "predict"):
+        return None
+    predict = lambda x: float(model.predict(x)[0])  # noqa: E731
+    try:
+        import numpy as np
+
+        predict(np.zeros((1, 7), dtype=float))
+    except Exception:
+        return None
+    return predict
 
 
-def _predict_with_model(x: np.ndarray, model) -> Dict[str, float]:
+def _predict_with_model(x: "np.ndarray", model_fn: Callable[["np.ndarray"], float]) -> Dict[str, float]:
     """
     Use a LinearRegression-like model to produce expected_loss, then derive PML.
     """
-    try:
-        y = float(model.predict(x)[0])
-        expected_loss = _clip_nonneg(y)
-    except Exception:
-        expected_loss = 0.0
+    expected_loss = _clip_nonneg(model_fn(x))
 
     # Derive PML as a conservative multiplier with a soft cap.
     pml = _clip_nonneg(expected_loss * 6.0)
@@ -87,43 +113,36 @@ def _predict_with_model(x: np.ndarray, model) -> Dict[str, float]:
 def _heuristics(state: Dict[str, Any]) -> Dict[str, float]:
     """
     Deterministic fallback if no model is present. Uses minimal signals.
+    Reuses the pair the hazard node computed with the same kernel call, and
+    only runs the kernel itself when that is absent.
     """
-    req = state.get("request") or {}
-    profile = state.get("profile") or {}
-    prop = req.get("property") or {}
-
-    revenue = float(req.get("annual_revenue") or 0.0)
-    employee_count = int(req.get("employee_count") or 0)
-    sqft = float(prop.get("sqft") or 0.0)
-    sprinklers = bool(prop.get("sprinklers"))
-    year_built = int(prop.get("year_built") or 1980)
-    tags: List[str] = list(profile.get("risk_tags") or [])
-
-    base = max(5_000.0, revenue * 0.002)  # floor or small share of revenue
-    base += 100.0 * employee_count
-    base += 0.05 * sqft
-    if not sprinklers:
-        base *= 1.15
-    if year_built < 1975:
-        base *= 1.10
-    if "cooking" in tags:
-        base *= 1.20
-    if "hazmat" in tags:
-        base *= 1.25
-
-    expected_loss = float(base)
-    pml = float(expected_loss * 5.0)
-    return {"expected_loss": expected_loss, "pml": pml}
+    pair = state.get("heuristic_loss")
+    if pair is None:
+        _, _, expected_loss, pml = compute_scores(*kernel_inputs(state))
+    else:
+        expected_loss, pml = pair
+    return {"expected_loss": float(expected_loss), "pml": float(pml)}
 
 
-def run(*, state: Dict[str, Any]) -> Dict[str, Any]:
+def run(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Compute `loss_estimates` and merge into state.
     """
-    estimates = _heuristics(state)
-    new_state = dict(state)
-    new_state["loss_estimates"] = {
-        "expected_loss": float(estimates["expected_loss"]),
-        "pml": float(estimates["pml"]),
+    model_path = get_settings().LOSS_MODEL_PATH
+    model_fn = _load_model(model_path) if model_path else None
+    estimates = None
+    if model_fn is not None:
+        try:
+            estimates = _predict_with_model(_features_for_model(state), model_fn)
+        except Exception:
+            # A model that validated at load time but fails on this input
+            # degrades to the heuristic rather than failing the request.
+            estimates = None
+    if estimates is None:
+        estimates = _heuristics(state)
+    return {
+        "loss_estimates": {
+            "expected_loss": float(estimates["expected_loss"]),
+            "pml": float(estimates["pml"]),
+        }
     }
-    return new_state
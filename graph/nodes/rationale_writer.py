@@ -0,0 +1,104 @@
+"""
+Rationale Writer node.
+
+Runs last, once hazard scores, loss estimates, and the recommendation exist,
+and asks the LLM for both explanations in a single structured response:
+{
+  "hazard_rationale": str,    # one sentence for the report
+  "coverage_rationale": str   # one or two customer-facing sentences
+}
+
+Output (merged into state):
+- `hazard_rationale` (scratch)
+- `rationale_fallback` (scratch; True if a default sentence was substituted)
+- `recommendation.rationale`
+"""
+
+from typing import Any, Dict
+
+from pydantic import BaseModel
+
+from ._llm import ainvoke_structured
+
+_DEFAULT_HAZARD_RATIONALE = "Scores based on operations and exposure characteristics."
+_DEFAULT_COVERAGE_RATIONALE = "Recommendation based on exposure and loss potential."
+
+_SYSTEM_PROMPT = "You are an insurance underwriting assistant."
+_HUMAN_TEMPLATE = (
+    "Business: {name}\n"
+    "Ops: {ops}\n"
+    "Tags: {tags}\n"
+    "Hazard scores: property={ph:.2f}, liability={le:.2f}\n"
+    "Loss: expected={el:,.0f}, pml={pml:,.0f}\n"
+    "Recommended coverages: {covs}\n"
+    "Fill: "
+    "hazard_rationale (one concise sentence explaining the hazard scores, suitable for a report), "
+    "coverage_rationale (one or two short, factual sentences suitable for a customer-facing rationale)."
+).format_map
+
+
+class _RationalesOut(BaseModel):
+    """Structured-output schema for the combined rationale call."""
+
+    hazard_rationale: str = ""
+    coverage_rationale: str = ""
+
+
+def _first_line(text: str, limit: int) -> str:
+    return text.strip().split("\n")[0][:limit]
+
+
+async def _llm_rationales(*, structured_llm: Any, state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ask the LLM for the hazard and coverage rationales in one round-trip.
+    Falls back to fixed sentences if the call fails or returns empty fields,
+    and reports that via `fallback`.
+    """
+    profile = state.get("profile") or {}
+    hazard = state.get("hazard_scores") or {}
+    loss = state.get("loss_estimates") or {}
+    rec = state.get("recommendation") or {}
+    human = _HUMAN_TEMPLATE(
+        {
+            "name": profile.get("business_name") or "the business",
+            "ops": profile.get("operations_summary") or "its operations",
+            "tags": ", ".join(profile.get("risk_tags") or []) or "none",
+            "ph": float(hazard.get("property_hazard") or 0.0),
+            "le": float(hazard.get("liability_exposure") or 0.0),
+            "el": float(loss.get("expected_loss") or 0.0),
+            "pml": float(loss.get("pml") or 0.0),
+            "covs": ", ".join(rec.get("coverages") or []),
+        }
+    )
+
+    try:
+        out = await ainvoke_structured(
+            structured_llm=structured_llm, schema=_RationalesOut, system=_SYSTEM_PROMPT, human=human
+        )
+    except Exception:
+        out = None
+    if out is None:
+        out = _RationalesOut()
+
+    hazard_rationale = _first_line(out.hazard_rationale, 240)
+    coverage_rationale = _first_line(out.coverage_rationale, 400)
+    return {
+        "hazard_rationale": hazard_rationale or _DEFAULT_HAZARD_RATIONALE,
+        "coverage_rationale": coverage_rationale or _DEFAULT_COVERAGE_RATIONALE,
+        "fallback": not (hazard_rationale and coverage_rationale),
+    }
+
+
+async def run(state: Dict[str, Any], structured_llm: Any = None) -> Dict[str, Any]:
+    """
+    Attach the hazard rationale and the recommendation's rationale.
+    `structured_llm` is `llm.with_structured_output(_RationalesOut)`.
+    """
+    rationales = await _llm_rationales(structured_llm=structured_llm, state=state)
+    rec = dict(state.get("recommendation") or {})
+    rec["rationale"] = rationales["coverage_rationale"]
+    return {
+        "hazard_rationale": rationales["hazard_rationale"],
+        "rationale_fallback": rationales["fallback"],
+        "recommendation": rec,
+    }
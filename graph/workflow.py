@@ -1,35 +1,46 @@
 """
-Workflow assembly using a Pydantic state model.
+Workflow assembly using a TypedDict state.
 
 Linear POC flow:
     business_profiler -> hazard_identifier -> loss_predictor -> coverage_designer
+        -> rationale_writer
+
+Only the first and last nodes call the LLM; the rationale writer produces the
+hazard and coverage rationales in one request.
 
 Key details:
-- The graph's state type is a Pydantic model (BaseModel) to satisfy LangGraph.
-- Node wrappers convert the Pydantic state <-> dict so node implementations
-  can stay simple and return dictionaries.
-- A small adapter lets callers pass either a dict or a WorkflowState into
-  `.invoke(...)` and always get a plain dict back.
+- The graph's state type is a TypedDict, so LangGraph carries plain dicts
+  between nodes without a Pydantic validation round-trip per node.
+- Node implementations take the state dict and return only the keys they
+  update; LangGraph merges the partial update into the state. LLM-backed nodes
+  get their `llm.with_structured_output(...)` runnable, built once here and
+  bound with `functools.partial`.
+- LLM-backed nodes are `async` so their HTTP waits release the event loop;
+  run the graph with `await ....ainvoke(...)`.
+- A small adapter lets callers `.ainvoke(...)` (or `.invoke(...)` from sync
+  code) with a dict and always get a plain dict back.
 """
 
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, ConfigDict, Field
+import asyncio
+from functools import partial
+from typing import Any, Dict, Optional, Tuple, TypedDict
 from langgraph.graph import END, StateGraph
 
 
-class WorkflowState(BaseModel):
+class WorkflowState(TypedDict, total=False):
     """
-    Pydantic state carried through the graph. Extra keys are allowed so nodes can
-    attach scratch data (e.g., rationales) without strict schema churn.
+    State carried through the graph. Every key a node writes must be declared
+    here; LangGraph drops undeclared keys from a TypedDict state.
     """
 
-    model_config = ConfigDict(extra="allow")
-
-    request: Dict[str, Any] = Field(default_factory=dict)
-    profile: Optional[Dict[str, Any]] = None
-    hazard_scores: Optional[Dict[str, Any]] = None
-    loss_estimates: Optional[Dict[str, Any]] = None
-    recommendation: Optional[Dict[str, Any]] = None
+    request: Dict[str, Any]
+    profile: Optional[Dict[str, Any]]
+    hazard_scores: Optional[Dict[str, Any]]
+    heuristic_loss: Optional[Tuple[float, float]]
+    hazard_rationale: Optional[str]
+    rationale_fallback: Optional[bool]
+    loss_estimates: Optional[Dict[str, Any]]
+    recommendation: Optional[Dict[str, Any]]
 
 
 def build_workflow(*, llm: Any):
@@ -37,62 +48,50 @@ def build_workflow(*, llm: Any):
     Build and compile the underwriting workflow graph.
     """
     # Local imports to avoid import errors before nodes exist.
-    from .nodes.business_profiler import run as bp_run
+    from .nodes.business_profiler import _EnrichmentOut, run as bp_run
     from .nodes.hazard_identifier import run as hz_run
     from .nodes.loss_predictor import run as ls_run
     from .nodes.coverage_designer import run as cd_run
+    from .nodes.rationale_writer import _RationalesOut, run as rw_run
 
-    # ---- Node wrappers: WorkflowState -> dict -> WorkflowState ----
-
-    def _bp_node(state: WorkflowState) -> WorkflowState:
-        new_state = bp_run(state=state.model_dump(), llm=llm)
-        return WorkflowState.model_validate(new_state)
-
-    def _hz_node(state: WorkflowState) -> WorkflowState:
-        new_state = hz_run(state=state.model_dump(), llm=llm)
-        return WorkflowState.model_validate(new_state)
-
-    def _ls_node(state: WorkflowState) -> WorkflowState:
-        new_state = ls_run(state=state.model_dump())
-        return WorkflowState.model_validate(new_state)
-
-    def _cd_node(state: WorkflowState) -> WorkflowState:
-        new_state = cd_run(state=state.model_dump(), llm=llm)
-        return WorkflowState.model_validate(new_state)
+    # Structured-output runnables are built once per graph, not per call.
+    profiler_llm = llm.with_structured_output(_EnrichmentOut)
+    rationale_llm = llm.with_structured_output(_RationalesOut)
 
     graph = StateGraph(WorkflowState)
-    graph.add_node("business_profiler", _bp_node)
-    graph.add_node("hazard_identifier", _hz_node)
-    graph.add_node("loss_predictor", _ls_node)
-    graph.add_node("coverage_designer", _cd_node)
+    # Nodes take the state dict positionally; their runnable is bound up front
+    # so LangGraph calls the node functions without an extra wrapper frame.
+    graph.add_node("business_profiler", partial(bp_run, structured_llm=profiler_llm))
+    graph.add_node("hazard_identifier", hz_run)
+    graph.add_node("loss_predictor", ls_run)
+    graph.add_node("coverage_designer", cd_run)
+    graph.add_node("rationale_writer", partial(rw_run, structured_llm=rationale_llm))
 
     graph.set_entry_point("business_profiler")
     graph.add_edge("business_profiler", "hazard_identifier")
     graph.add_edge("hazard_identifier", "loss_predictor")
     graph.add_edge("loss_predictor", "coverage_designer")
-    graph.add_edge("coverage_designer", END)
+    graph.add_edge("coverage_designer", "rationale_writer")
+    graph.add_edge("rationale_writer", END)
 
     compiled = graph.compile()
 
     class _CompiledWorkflowAdapter:
         """
-        Small adapter to make `.invoke(...)` ergonomic:
-        - Accepts dict OR WorkflowState
+        Small adapter to make `.ainvoke(...)` / `.invoke(...)` ergonomic:
+        - Accepts any mapping with WorkflowState keys
         - Always returns a plain dict
         """
 
         def __init__(self, inner):
             self._inner = inner
 
+        async def ainvoke(self, input_state: Any) -> Dict[str, Any]:
+            out = await self._inner.ainvoke(input_state)
+            return dict(out)
+
         def invoke(self, input_state: Any) -> Dict[str, Any]:
-            if isinstance(input_state, WorkflowState):
-                state = input_state
-            else:
-                state = WorkflowState.model_validate(input_state)
-            out = self._inner.invoke(state)
-            # `out` is a WorkflowState; normalize to dict for API layer.
-            if isinstance(out, WorkflowState):
-                return out.model_dump()
-            return out
+            # Nodes are async, so sync callers (scripts, tests) get their own loop.
+            return asyncio.run(self.ainvoke(input_state))
 
     return _CompiledWorkflowAdapter(compiled)
@@ -1,18 +1,52 @@
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict
 from contextlib import asynccontextmanager
+from functools import lru_cache
+import orjson
+import xxhash
+from cachetools import LRUCache
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
-from langchain_google_genai import ChatGoogleGenerativeAI
 
 from config import get_settings
 from graph.workflow import WorkflowState, build_workflow
 from schemas import UnderwritingRequest, UnderwritingResponse
 
+if TYPE_CHECKING:  # heavy import (langchain + google SDKs); loaded lazily in _get_llm
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+
+# Final responses keyed by a hash of the canonicalized request. Bounded so
+# repeated quote requests skip the pipeline without unbounded memory growth.
+_RESP_CACHE: LRUCache = LRUCache(maxsize=1024)
+
+
+def _request_key(payload: Dict[str, Any]) -> int:
+    return xxhash.xxh3_64(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).intdigest()
+
+
+@lru_cache(maxsize=None)
+def _get_llm() -> "ChatGoogleGenerativeAI":
+    """Process-wide chat model client (shared by forked workers under --preload)."""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    settings = get_settings()
+    return ChatGoogleGenerativeAI(
+        model=settings.GOOGLE_MODEL_NAME,
+        google_api_key=settings.GOOGLE_API_KEY,
+        temperature=settings.LLM_TEMPERATURE,
+        max_output_tokens=settings.LLM_MAX_OUTPUT_TOKENS,
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_workflow():
+    """Compile the underwriting graph once per process."""
+    return build_workflow(llm=_get_llm())
+
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    llm = ChatGoogleGenerativeAI(model=settings.GOOGLE_MODEL_NAME)
-    app.state.workflow = build_workflow(llm=llm)
+    app.state.workflow = _get_workflow()
     try:
         yield
     finally:
@@ -24,20 +58,35 @@ app = FastAPI(title="CIRAN Underwriter", version="1.0", lifespan=lifespan)
 
 
 @app.post("/underwrite", response_model=UnderwritingResponse)
-def underwrite(request: UnderwritingRequest, http_req: Request):
+async def underwrite(request: UnderwritingRequest, http_req: Request):
     """Run the underwriting pipeline end-to-end."""
     try:
-        initial_state = WorkflowState(
-            request=request.model_dump(),
-            hazard_scores=None,
-            loss_estimates=None,
-            recommendation=None
-        )
+        payload = request.model_dump()
+        key = _request_key(payload)
+        cached = _RESP_CACHE.get(key)
+        if cached is not None:
+            return JSONResponse(content=cached)
+
+        initial_state: WorkflowState = {
+            "request": payload,
+            "hazard_scores": None,
+            "loss_estimates": None,
+            "recommendation": None,
+        }
         workflow = http_req.app.state.workflow  # properly typed via Request.app
-        result_state: Dict[str, Any] = workflow.invoke(initial_state)
+        result_state: Dict[str, Any] = await workflow.ainvoke(initial_state)
 
-        response = UnderwritingResponse.model_validate(result_state)
-        return JSONResponse(content=response.model_dump(mode="json"))
+        # The state also carries request/profile/scratch keys; validate only
+        # the response fields since the schema forbids extras.
+        response = UnderwritingResponse.model_validate(
+            {field: result_state.get(field) for field in UnderwritingResponse.model_fields}
+        )
+        content = response.model_dump(mode="json")
+        # Don't pin default rationales (e.g. from a transient LLM outage) to
+        # this request; the next identical request retries the LLM.
+        if not result_state.get("rationale_fallback"):
+            _RESP_CACHE[key] = content
+        return JSONResponse(content=content)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Underwriting failed: {exc}") from exc
 
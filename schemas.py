@@ -3,6 +3,9 @@ Data schemas for request/response validation.
 
 These models are used by the FastAPI layer and also as a contract for the
 workflow's final output.
+
+All models use `defer_build=True` so their core schemas are built on first use
+rather than at import time.
 """
 
 from typing import Dict, List, Optional
@@ -12,7 +15,7 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator
 class Address(BaseModel):
     """Basic address information; coordinates are optional."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     line1: Optional[str] = None
     city: Optional[str] = None
@@ -26,7 +29,7 @@ class Address(BaseModel):
 class PropertyInfo(BaseModel):
     """Lightweight property characteristics used by risk nodes."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     construction: Optional[str] = None
     year_built: Optional[int] = Field(default=None, ge=1800, le=2100)
@@ -37,7 +40,7 @@ class PropertyInfo(BaseModel):
 class OperationsInfo(BaseModel):
     """Business operations metadata."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     description: str = Field(..., min_length=3)
     hours_per_week: Optional[int] = Field(default=None, ge=0, le=168)
@@ -49,7 +52,7 @@ class UnderwritingRequest(BaseModel):
     still being realistic enough for the nodes to operate on.
     """
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     business_name: str = Field(..., min_length=1)
     naics_code: Optional[str] = None
@@ -68,7 +71,7 @@ class UnderwritingRequest(BaseModel):
 class HazardScores(BaseModel):
     """Qualitative/relative hazard scoring produced by the hazard node."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     property_hazard: float = Field(..., ge=0.0, le=1.0)
     liability_exposure: float = Field(..., ge=0.0, le=1.0)
@@ -77,7 +80,7 @@ class HazardScores(BaseModel):
 class LossEstimates(BaseModel):
     """Quantitative loss metrics produced by the loss node."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     expected_loss: float = Field(..., ge=0.0)
     pml: float = Field(..., ge=0.0, description="Probable maximum loss")
@@ -90,7 +93,7 @@ class Recommendation(BaseModel):
     produced with an LLM for readability.
     """
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     coverages: List[str]
     policy_limits: Dict[str, float]
@@ -105,7 +108,7 @@ class UnderwritingResponse(BaseModel):
     which we validate before returning to the client.
     """
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     hazard_scores: HazardScores
     loss_estimates: LossEstimates
@@ -6,25 +6,88 @@ downstream nodes can import. If you later connect real services, replace the
 stub functions while keeping the signatures.
 """
 
-from typing import Any, Dict, List
+import math
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Optional, Sequence, Tuple, Union
 
+if TYPE_CHECKING:  # NumPy is only needed by the batch helpers; imported lazily there.
+    import numpy as np
 
-def fetch_industry_hazards(*, naics_code: str | None) -> List[str]:
+# Lookup tables keyed by the 2-digit NAICS sector prefix, built once at import.
+_EMPTY: Tuple[str, ...] = ()
+_HAZARDS_BY_PREFIX: Dict[str, Tuple[str, ...]] = {
+    "72": ("cooking", "public_foot_traffic"),         # Accommodation & Food
+    "44": ("public_foot_traffic",),                   # Retail trade
+    "23": ("contractor_tools", "work_at_height"),     # Construction
+    "31": ("flammables", "machinery"),                # Manufacturing
+    "42": ("warehouse_racking", "forklifts"),         # Wholesale
+}
+
+# Benchmarks are shared across calls, so they are read-only views.
+_DEFAULT_BENCH: Mapping[str, float] = MappingProxyType(
+    {"el_per_million_revenue": 2_000.0, "pml_multiplier": 5.0}
+)
+_BENCHMARKS_BY_PREFIX: Dict[str, Mapping[str, float]] = {
+    "72": MappingProxyType({"el_per_million_revenue": 4_000.0, "pml_multiplier": 6.0}),
+    "44": MappingProxyType({"el_per_million_revenue": 2_500.0, "pml_multiplier": 5.5}),
+    "23": MappingProxyType({"el_per_million_revenue": 3_500.0, "pml_multiplier": 6.5}),
+    "31": MappingProxyType({"el_per_million_revenue": 3_000.0, "pml_multiplier": 6.0}),
+    "42": MappingProxyType({"el_per_million_revenue": 2_200.0, "pml_multiplier": 5.0}),
+}
+
+# Location-note tags and their multipliers. Add a row here to add a tag; the
+# regex (one pass over the notes) and the batch arrays are derived from it.
+_LOC_ADJUSTMENTS: Tuple[Tuple[str, float], ...] = (
+    ("multi_site", 1.05),
+    ("sprinklers_present", 0.95),
+)
+_LOC_RE = re.compile(r"\b(" + "|".join(re.escape(k) for k, _ in _LOC_ADJUSTMENTS) + r")\b")
+
+# 100-slot views of the tables above, indexed by the prefix as an int 0..99.
+_HAZARDS_BY_INT: Tuple[Tuple[str, ...], ...] = tuple(
+    _HAZARDS_BY_PREFIX.get(f"{i:02d}", _EMPTY) for i in range(100)
+)
+_BENCHMARKS_BY_INT: Tuple[Mapping[str, float], ...] = tuple(
+    _BENCHMARKS_BY_PREFIX.get(f"{i:02d}", _DEFAULT_BENCH) for i in range(100)
+)
+
+
+def _prefix_index(naics_code: str) -> int:
+    """Return the 2-digit NAICS prefix as 0..99, or -1 if it isn't two ASCII digits."""
+    if len(naics_code) < 2:
+        return -1
+    hi = ord(naics_code[0]) - 48
+    lo = ord(naics_code[1]) - 48
+    if 0 <= hi <= 9 and 0 <= lo <= 9:
+        return hi * 10 + lo
+    return -1
+
+
+# Positional, cached lookups behind the keyword-only public functions. Keyed on
+# the full code, so repeat NAICS codes in a batch are a single cache hit.
+@lru_cache(maxsize=256)
+def _hazards(naics_code: str) -> Tuple[str, ...]:
+    idx = _prefix_index(naics_code)
+    return _HAZARDS_BY_INT[idx] if idx >= 0 else _EMPTY
+
+
+@lru_cache(maxsize=256)
+def _benchmarks(naics_code: str) -> Mapping[str, float]:
+    idx = _prefix_index(naics_code)
+    return _BENCHMARKS_BY_INT[idx] if idx >= 0 else _DEFAULT_BENCH
+
+
+def fetch_industry_hazards(*, naics_code: str | None) -> Sequence[str]:
     """
     Return coarse hazard tags by NAICS. Deterministic and tiny on purpose.
+    The same immutable tuple is returned on every call; use `list(...)` if
+    you need to modify it.
     """
     if not naics_code:
-        return []
-    prefix = naics_code[:2]
-
-    mapping = {
-        "72": ["cooking", "public_foot_traffic"],         # Accommodation & Food
-        "44": ["public_foot_traffic"],                    # Retail trade
-        "23": ["contractor_tools", "work_at_height"],     # Construction
-        "31": ["flammables", "machinery"],                # Manufacturing
-        "42": ["warehouse_racking", "forklifts"],         # Wholesale
-    }
-    return mapping.get(prefix, [])
+        return _EMPTY
+    return _hazards(naics_code)
 
 
 def fetch_location_signals(*, profile: Dict[str, Any]) -> Dict[str, float]:
@@ -33,27 +96,122 @@ def fetch_location_signals(*, profile: Dict[str, Any]) -> Dict[str, float]:
     Returns multipliers rather than absolutes.
     """
     loc_notes = (profile or {}).get("location_notes", "")
-    multi = 1.0
-    if "multi_site" in loc_notes:
-        multi *= 1.05
-    if "sprinklers_present" in loc_notes:
-        multi *= 0.95
+    # Each tag applies at most once, however often it appears in the notes.
+    tags = set(_LOC_RE.findall(loc_notes))
+    multi = math.prod((m for k, m in _LOC_ADJUSTMENTS if k in tags), start=1.0)
     return {"location_multiplier": multi}
 
 
-def fetch_loss_benchmarks(*, naics_code: str | None) -> Dict[str, float]:
+def fetch_loss_benchmarks(*, naics_code: str | None) -> Mapping[str, float]:
     """
     Tiny, hard-coded industry benchmarks to seed loss estimates.
+    The returned mapping is shared and read-only; copy it with `dict(...)`
+    before modifying.
     """
     if not naics_code:
-        return {"el_per_million_revenue": 2_000.0, "pml_multiplier": 5.0}
-
-    prefix = naics_code[:2]
-    table = {
-        "72": {"el_per_million_revenue": 4_000.0, "pml_multiplier": 6.0},
-        "44": {"el_per_million_revenue": 2_500.0, "pml_multiplier": 5.5},
-        "23": {"el_per_million_revenue": 3_500.0, "pml_multiplier": 6.5},
-        "31": {"el_per_million_revenue": 3_000.0, "pml_multiplier": 6.0},
-        "42": {"el_per_million_revenue": 2_200.0, "pml_multiplier": 5.0},
-    }
-    return table.get(prefix, {"el_per_million_revenue": 2_000.0, "pml_multiplier": 5.0})
+        return _DEFAULT_BENCH
+    return _benchmarks(naics_code)
+
+
+@lru_cache(maxsize=None)
+def _benchmark_arrays() -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Read-only float64 (EL, PML) tables with 101 slots: 0..99 by NAICS prefix,
+    plus slot 100 holding the default for missing/invalid codes.
+    """
+    import numpy as np
+
+    rows = _BENCHMARKS_BY_INT + (_DEFAULT_BENCH,)
+    el = np.array([b["el_per_million_revenue"] for b in rows], dtype=np.float64)
+    pml = np.array([b["pml_multiplier"] for b in rows], dtype=np.float64)
+    el.flags.writeable = False
+    pml.flags.writeable = False
+    return el, pml
+
+
+def fetch_loss_benchmarks_batch(
+    naics_codes: Union[Sequence[Optional[str]], "np.ndarray"],
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Vectorized `fetch_loss_benchmarks` for many submissions at once.
+
+    Returns two float64 arrays aligned with `naics_codes`:
+    (el_per_million_revenue, pml_multiplier). Missing or invalid codes get the
+    default benchmark, matching the scalar function.
+    """
+    import numpy as np
+
+    el_table, pml_table = _benchmark_arrays()
+
+    codes = np.asarray(naics_codes, dtype=object)
+    codes = np.where(codes == None, "", codes)  # noqa: E711 - elementwise None check
+    # Keep the first two characters and read them as code points.
+    digits = codes.astype("U2").view(np.uint32).reshape(-1, 2).astype(np.intp) - 48
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    idx = np.where(valid, digits[:, 0] * 10 + digits[:, 1], len(el_table) - 1)
+    return el_table[idx], pml_table[idx]
+
+
+@lru_cache(maxsize=None)
+def _location_mults() -> "np.ndarray":
+    """
+    float64 multipliers aligned with `_LOC_ADJUSTMENTS`. Shared; do not modify.
+    (Left writeable: Numba types read-only arrays differently from the
+    `float64[:]` kernel signature.)
+    """
+    import numpy as np
+
+    return np.array([m for _, m in _LOC_ADJUSTMENTS], dtype=np.float64)
+
+
+def _mult_rows(mask: "np.ndarray", weights: "np.ndarray", out: "np.ndarray") -> None:
+    """
+    Per row, multiply the weights whose mask column is set (1.0 if none) into
+    `out`. The caller allocates `out`, so the body stays import-free for Numba.
+    """
+    n, k = mask.shape
+    for i in range(n):
+        m = 1.0
+        for j in range(k):
+            if mask[i, j]:
+                m *= weights[j]
+        out[i] = m
+
+
+@lru_cache(maxsize=None)
+def _mult_kernel() -> Callable[["np.ndarray", "np.ndarray", "np.ndarray"], None]:
+    """
+    Compile `_mult_rows` with Numba on first use (eager, signature-typed, and
+    disk-cached). Without Numba, fall back to an equivalent NumPy reduction.
+    """
+    try:
+        from numba import njit
+    except Exception:  # pragma: no cover
+        import numpy as np
+
+        def _np_mult_rows(mask: "np.ndarray", weights: "np.ndarray", out: "np.ndarray") -> None:
+            np.where(mask, weights, 1.0).prod(axis=1, out=out)
+
+        return _np_mult_rows
+    return njit("void(boolean[:, :], float64[:], float64[:])", cache=True, fastmath=True)(_mult_rows)
+
+
+def fetch_location_signals_batch(profiles: Sequence[Dict[str, Any]]) -> "np.ndarray":
+    """
+    Vectorized `fetch_location_signals` for many profiles at once.
+
+    Returns a float64 array of location multipliers aligned with `profiles`.
+    Tag presence is gathered into an (N, K) boolean mask and reduced by a
+    Numba-compiled kernel (NumPy fallback when Numba is not installed).
+    """
+    import numpy as np
+
+    keys = [k for k, _ in _LOC_ADJUSTMENTS]
+    mask = np.zeros((len(profiles), len(keys)), dtype=np.bool_)
+    for i, profile in enumerate(profiles):
+        tags = set(_LOC_RE.findall((profile or {}).get("location_notes", "")))
+        for j, key in enumerate(keys):
+            mask[i, j] = key in tags
+    out = np.empty(len(profiles), dtype=np.float64)
+    _mult_kernel()(mask, _location_mults(), out)
+    return out
@@ -5,45 +5,267 @@ Usage:
     from utils.logging import get_logger
     log = get_logger(__name__)
     log.info("message", extra={"ctx": {"request_id": "...", "node": "..."}})
+
+`ctx` may also be a zero-argument callable returning the dict; it is only
+called when the record is actually formatted, so building the context costs
+nothing for records filtered out by level:
+    log.debug("scored", extra={"ctx": lambda: {"scores": expensive_summary()}})
+
+Output is JSON lines when stdout is not a terminal and plain
+"LEVEL name message" text when it is; set `CIRAN_LOG_FORMAT=json|text` to
+force either.
+
+Records are handed to a background `QueueListener` thread, which does the
+formatting and the (buffered) write. Message args are therefore
+formatted after the call returns; don't mutate objects passed as args.
+The threads are restarted in forked children, so pre-forking servers
+(Gunicorn `--preload`) keep logging from every worker.
+
+Write path: the listener appends records to a 64 KiB buffered stream that is
+flushed every 50 ms, on ERROR, and at exit (after the listener has drained
+the queue), so many records go out in a single write() syscall, off the
+request threads. An io_uring backend would only batch those already-rare
+flushes further, so it is deliberately not used.
 """
 
+import atexit
 import json
 import logging
+import logging.handlers
+import os
+import queue
+import re
 import sys
-from typing import Any, Dict
+import threading
+import time
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii as _esc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+def _json_default(obj: Any) -> Any:
+    """Last resort for ctx values neither encoder knows: a number if possible, else text."""
+    try:
+        return float(obj)
+    except Exception:
+        return str(obj)
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    # ensure_ascii=True keeps string escaping on the C
+    # encode_basestring_ascii path (ensure_ascii=False is far slower);
+    # compact separators drop padding spaces.
+    return json.dumps(obj, ensure_ascii=True, separators=(",", ":"), default=_json_default)
+
+
+try:
+    # orjson (C/SIMD) is much cheaper per record than stdlib json. The options
+    # accept non-str dict keys and NumPy scalars/arrays (the pipeline's scores
+    # are NumPy-derived). Anything orjson still refuses without consulting
+    # `default` (e.g. ints wider than 64 bits) is retried with stdlib json.
+    import orjson
+
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            return _stdlib_dumps(obj)
+except Exception:  # pragma: no cover
+    _dumps = _stdlib_dumps
+
+
+# ASCII characters JSON requires escaping: quote, backslash, control chars.
+_NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f]')
+
+
+def _json_str(s: str) -> str:
+    """
+    JSON-quote `s`. Plain ASCII with nothing to escape (the common case for
+    log fields) is wrapped in quotes directly: `isascii()` is an O(1) flag
+    check and the regex scan runs in C. Everything else goes straight to the
+    C string escaper, bypassing the generic encoder.
+    """
+    if s.isascii() and not _NEEDS_ESCAPE.search(s):
+        return '"' + s + '"'
+    return _esc(s)
+
+
+# Level and logger names repeat across records; quote each distinct one once.
+_LEVEL_JSON: Dict[str, str] = {
+    lvl: _json_str(lvl) for lvl in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+}
+_name_json = lru_cache(maxsize=256)(_json_str)
+
+
+# One straight-line encoder per combination of optional members, indexed by
+# `(has_exc << 1) | has_ctx`. Plain `+` concatenation of the pre-quoted
+# fields avoids re-parsing a %-template per record; only ctx needs the full
+# JSON encoder.
+_ENCODERS: Tuple[Callable[[str, str, str, Optional[str], Optional[Dict[str, Any]]], str], ...] = (
+    lambda level, name, msg, exc, ctx: '{"level":' + level + ',"name":' + name + ',"msg":' + msg + "}",
+    lambda level, name, msg, exc, ctx: (
+        '{"level":' + level + ',"name":' + name + ',"msg":' + msg
+        + ',"ctx":' + _dumps(ctx) + "}"
+    ),
+    lambda level, name, msg, exc, ctx: (
+        '{"level":' + level + ',"name":' + name + ',"msg":' + msg
+        + ',"exc_info":' + _esc(exc) + "}"
+    ),
+    lambda level, name, msg, exc, ctx: (
+        '{"level":' + level + ',"name":' + name + ',"msg":' + msg
+        + ',"exc_info":' + _esc(exc) + ',"ctx":' + _dumps(ctx) + "}"
+    ),
+)
 
 
 class _JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:  # noqa: D401
-        payload: Dict[str, Any] = {
-            "level": record.levelname,
-            "name": record.name,
-            "msg": record.getMessage(),
-        }
-        if record.exc_info:
-            payload["exc_info"] = self.formatException(record.exc_info)
-        # Accept `extra={"ctx": {...}}`
-        ctx = getattr(record, "ctx", None)
-        if isinstance(ctx, dict):
-            payload["ctx"] = ctx
-        return json.dumps(payload, ensure_ascii=False)
+        # Without args there is nothing to %-format; skip getMessage().
+        msg = record.getMessage() if record.args else record.msg
+        if not isinstance(msg, str):
+            msg = str(msg)
+        exc = self.formatException(record.exc_info) if record.exc_info else None
+        # Accept `extra={"ctx": {...}}` or a lazy `extra={"ctx": lambda: {...}}`.
+        ctx = record.__dict__.get("ctx")
+        if callable(ctx):
+            ctx = ctx()
+        if not isinstance(ctx, dict):
+            ctx = None
+        encode = _ENCODERS[((exc is not None) << 1) | (ctx is not None)]
+        level = _LEVEL_JSON.get(record.levelname) or _json_str(record.levelname)
+        return encode(level, _name_json(record.name), _json_str(msg), exc, ctx)
+
+
+_STREAM_BUFFER_SIZE = 64 * 1024
+_FLUSH_INTERVAL_S = 0.05
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that does not flush after every record. Output accumulates
+    in the stream's buffer and is flushed every `_FLUSH_INTERVAL_S` by a
+    daemon thread, at exit, and immediately for ERROR and above.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def _flush_periodically(handler: logging.Handler) -> None:
+    while True:
+        time.sleep(_FLUSH_INTERVAL_S)
+        handler.flush()
+
+
+def _make_stream_handler() -> logging.StreamHandler:
+    """
+    Buffered handler writing to a private dup of stdout's fd, so closing our
+    stream never closes sys.stdout. Falls back to a plain StreamHandler when
+    stdout has no real fd (e.g. captured under a test runner).
+    """
+    try:
+        fd = os.dup(sys.stdout.fileno())
+    except Exception:
+        return logging.StreamHandler(sys.stdout)
+    stream = open(fd, "w", buffering=_STREAM_BUFFER_SIZE, encoding="utf-8")
+    return _BufferedStreamHandler(stream)
+
+
+class _PassthroughQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched. The stock `prepare()`
+    formats the message on the calling thread; here all formatting happens on
+    the listener thread. The queue is in-process, so records need no pickling.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _make_formatter() -> logging.Formatter:
+    """
+    JSON for log pipelines, plain text for interactive terminals.
+    `CIRAN_LOG_FORMAT=json|text` overrides the TTY detection.
+    """
+    choice = os.getenv("CIRAN_LOG_FORMAT", "").strip().lower()
+    if choice not in ("json", "text"):
+        try:
+            choice = "text" if sys.stdout.isatty() else "json"
+        except Exception:
+            choice = "json"
+    if choice == "text":
+        return logging.Formatter("%(levelname)s %(name)s %(message)s")
+    return _JsonFormatter()
+
+
+def _start_log_threads(queue_handler: logging.handlers.QueueHandler, handler: logging.Handler) -> None:
+    """
+    Start the listener (and, for the buffered handler, the flusher) thread on
+    a fresh queue. Runs at configuration and again in every forked child:
+    threads don't survive fork(), so without this a worker forked after
+    import (e.g. Gunicorn `--preload`) would enqueue records nothing drains.
+    """
+    # Producers only enqueue; a single listener thread formats and writes.
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler.queue = log_queue
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    if isinstance(handler, _BufferedStreamHandler):
+        threading.Thread(target=_flush_periodically, args=(handler,), name="ciran-log-flush", daemon=True).start()
+    setattr(logging.getLogger(), "_ciran_listener", listener)
+
+
+def _shutdown(handler: logging.Handler) -> None:
+    """
+    At exit, stop the listener first (which drains the queue into the
+    handler), then flush the handler's buffer, so the last records are kept.
+    """
+    listener = getattr(logging.getLogger(), "_ciran_listener", None)
+    if listener is not None and listener._thread is not None:
+        listener.stop()
+    handler.flush()
 
 
 def _configure_root(level: int = logging.INFO) -> None:
     root = logging.getLogger()
-    # Clear existing handlers only once.
-    if getattr(root, "_ciran_configured", False):
-        return
     root.setLevel(level)
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(_JsonFormatter())
-    root.addHandler(handler)
+    handler = _make_stream_handler()
+    handler.setFormatter(_make_formatter())
+    queue_handler = _PassthroughQueueHandler(queue.SimpleQueue())
+    root.addHandler(queue_handler)
+    _start_log_threads(queue_handler, handler)
+    if hasattr(os, "register_at_fork"):
+        # Flush before forking so the child doesn't inherit (and re-emit) the
+        # parent's buffered output, and hold the handler lock across fork() so
+        # the listener can't be mid-write (holding the stream's buffer lock)
+        # when the child is created. logging re-creates handler locks in the
+        # child itself; there we only restart the threads.
+        os.register_at_fork(
+            before=lambda: (handler.acquire(), handler.flush()),
+            after_in_parent=handler.release,
+            after_in_child=lambda: _start_log_threads(queue_handler, handler),
+        )
+    atexit.register(_shutdown, handler)
     setattr(root, "_ciran_configured", True)
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     """
-    Get a module logger with JSON formatting attached to the root once.
+    Get a module logger. The root handler (JSON or text) is attached once,
+    when this module is imported.
     """
-    _configure_root()
     return logging.getLogger(name)
+
+
+# One-shot setup at import; the guard covers module reloads.
+if not getattr(logging.getLogger(), "_ciran_configured", False):
+    _configure_root()